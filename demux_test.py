@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+
+import io
+import os
+import parse_test
+
+sample = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                      'testdata', 'two_queuesets.log')
+
+
+def test_interleaved() -> None:
+    test_parser = parse_test.TestParser()
+    with open(sample, 'rt') as file:
+        test_parser.parse(file)
+    assert list(test_parser.queue_sets) == ['a', 'b']
+    qsa, qsb = test_parser.queue_sets['a'], test_parser.queue_sets['b']
+    assert set(qsa.requests) == {(1, 0, 0), (2, 0, 0)}
+    assert set(qsb.requests) == {(1, 0, 0)}
+    assert qsa.requests[(1, 0, 0)].queue == 3
+    assert qsb.requests[(1, 0, 0)].queue == 0
+    assert len(qsa.seats) == 2 and len(qsb.seats) == 1
+    assert list(qsa.queue_to_lanes) == [3] and qsa.queue_lane_sum == 2
+    assert list(qsb.queue_to_lanes) == [0] and qsb.queue_lane_sum == 1
+    # QS(a)'s End arrives while QS(b) is still running, so it cannot be
+    # attributed; QS(b)'s later End is unambiguous.
+    assert qsa.eval_t is None
+    assert qsb.eval_t == parse_test.time_parse('2026-10-19 10:00:05.000000000')
+    return
+
+
+def test_end_per_queueset() -> None:
+    # Same events, but as two consecutive tests that each write an End line
+    with open(sample, 'rt') as file:
+        lines = [line for line in file if 'QS(' in line]
+    end_a = '    queueset_test.go:1: 2026-10-19 10:00:02.000000000: End\n'
+    end_b = '    queueset_test.go:1: 2026-10-19 10:00:05.000000000: End\n'
+    log = ''.join([line for line in lines if 'QS(a)' in line] + [end_a]
+                  + [line for line in lines if 'QS(b)' in line] + [end_b])
+    test_parser = parse_test.TestParser()
+    test_parser.parse(io.StringIO(log))
+    assert test_parser.queue_sets['a'].eval_t == parse_test.time_parse(
+        '2026-10-19 10:00:02.000000000')
+    assert test_parser.queue_sets['b'].eval_t == parse_test.time_parse(
+        '2026-10-19 10:00:05.000000000')
+    return
+
+
+if __name__ == '__main__':
+    test_interleaved()
+    test_end_per_queueset()
+    print('ok')
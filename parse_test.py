@@ -308,69 +308,20 @@ class SeatAllocator():
     pass
 
 
-class TestParser(parse.Parser, SeatAllocator, ProgressNoter):
+class QueueSetParse(SeatAllocator, ProgressNoter):
 
-    def __init__(self):
-        super(TestParser, self).__init__()
+    def __init__(self, name: str):
+        super(QueueSetParse, self).__init__()
+        self.name = name
         self.requests: typing.Mapping[typing.Tuple[int,
                                                    int, int], Request] = dict()
-        self.cases: typing.List[typing.Tuple[re.Pattern,
-                                             typing.Callable[[re.Match], None]]] = []
         self.num_queues: int = 0
         self.queue_to_lanes: typing.Mapping[int, SeatAllocator] = dict()
         self.queue_lane_sum: int = 0
         self.max_flow: int = 0
         self.min_t = Time(datetime.datetime(2050, 1, 1), 0)
         self.max_t = Time(datetime.datetime(2000, 1, 1), 0)
-
-        def consume_dispatch(match: re.Match) -> None:
-            # print(f'Parsed {match.groupdict()}')
-            req = self.get_req(match.group('flow'), match.group(
-                'thread'), match.group('iter'))
-            req.set_dispatch(match.group('realStartT'), match.group('realStartR'), match.group(
-                'queue'), match.group('width1'), match.group('width2'), match.group('pad'), match.group('virtStartR'), self.find_seats)
-            self.add_progress_point(req.real_dispatch_t, req.real_dispatch_r)
-
-        self.add_case(r'I[0-9]{4} [0-9.:]+\s+[0-9]+ queueset\.go:[0-9]+\] QS\(.*\) at [tr]=(?P<realStartT>[-0-9 .:]+) [vR]=(?P<realStartR>[0-9.]+)ss: dispatching request "(?P<desc1>.*)" \[\]int\{(?P<flow>[0-9]+), (?P<thread>[0-9]+), (?P<iter>[0-9]+)\} work \{\{?(?P<width1>[0-9]+)( (?P<width2>[0-9]+))? (?P<pad>[0-9.]+[mun' '\xb5' r']?s)(\} [0-9]+)\} from queue (?P<queue>[0-9]+) with start R (?P<virtStartR>[0-9.]+)ss, queue will have [0-9]+ waiting & [0-9]+ requests occupying [0-9]+ seats, set will have [0-9]+ seats occupied',
-                      consume_dispatch)
-
-        def consume_finish(match: re.Match) -> None:
-            req = self.get_req(match.group('flow'), match.group(
-                'thread'), match.group('iter'))
-            req.set_finish(match.group('realEndT'), match.group('realEndR'), match.group(
-                'queue'), match.group('width'), match.group('duration'), self.release_seats)
-            self.add_progress_point(req.real_finish_t, req.real_finish_r)
-
-        self.add_case(r'I[0-9]{4} [0-9.:]+\s+[0-9]+ queueset\.go:[0-9]+\] QS(.*) at [rt]=(?P<realEndT>[-0-9 .:]+) [vR]=(?P<realEndR>[0-9.]+)ss: request "(?P<desc1>.*)" \[\]int\{(?P<flow>[0-9]+), (?P<thread>[0-9]+), (?P<iter>[0-9]+)\} finished all use of (?P<width>[0-9]+) seats, adjusted queue (?P<queue>[0-9]+) start R to (?P<newStartR>[0-9.]+)ss due to service time (?P<duration>[0-9.]+)s, queue will have \d+ requests, \d+ seats waiting & \d+ requests occupying \d+ seats',
-                      consume_finish)
-        self.add_case(r'I[0-9]{4} [0-9.:]+\s+[0-9]+ queueset\.go:[0-9]+\] QS(.*) at [rt]=(?P<realEndT>[-0-9 .:]+) [vR]=(?P<realEndR>[0-9.]+)ss: request "(?P<desc1>.*)" \[\]int\{(?P<flow>[0-9]+), (?P<thread>[0-9]+), (?P<iter>[0-9]+)\} finished all use of (?P<width>[0-9]+) seats, adjusted queue (?P<queue>[0-9]+) start R to (?P<newStartR>[0-9.]+)ss due to service time (?P<duration>[0-9.]+)s, queue sum: queueset.queueSum\{InitialSeatsSum:\d+, MaxSeatsSum:\d+, TotalWorkSum:[0-9a-fA-Fx]+\}, \d+ requests waiting & \d+ requests occupying \d+ seats',
-                      consume_finish)
-
-        def consume_mid(match: re.Match) -> None:
-            req = self.get_req(match.group('flow'), match.group(
-                'thread'), match.group('iter'))
-            req.set_mid(match.group('realMidT'), match.group('realMidR'), match.group(
-                'queue'), match.group('width1'), match.group('pad'), match.group('duration'))
-            self.add_progress_point(req.real_mid_t, req.real_mid_r)
-
-        self.add_case(r'I[0-9]{4} [0-9.:]+\s+[0-9]+ queueset\.go:[0-9]+\] QS(.*) at [rt]=(?P<realMidT>[-0-9 .:]+) [vR]=(?P<realMidR>[0-9.]+)ss: request "(?P<desc1>.*)" \[\]int\{(?P<flow>[0-9]+), (?P<thread>[0-9]+), (?P<iter>[0-9]+)\} finished main use but lingering on (?P<width1>[0-9]+) seats for (?P<pad>[0-9.]+) seconds, adjusted queue (?P<queue>[0-9]+) start R to (?P<newStartR>[0-9.]+)ss due to service time (?P<duration>[0-9.]+)s, queue will have \d+ requests with queueset.queueSum\{.*\} waiting & \d+ requests occupying \d+ seats',
-                      consume_mid)
-
-        def consume_linger_finish(match: re.Match) -> None:
-            req = self.get_req(match.group('flow'), match.group(
-                'thread'), match.group('iter'))
-            req.finish_linger(match.group('realEndT'), match.group('realEndR'), match.group(
-                'queue'), self.release_seats)
-            self.add_progress_point(req.real_finish_t, req.real_finish_r)
-
-        self.add_case(r'I[0-9]{4} [0-9.:]+\s+[0-9]+ queueset\.go:[0-9]+\] QS(.*) at [rt]=(?P<realEndT>[-0-9 .:]+) [vR]=(?P<realEndR>[0-9.]+)ss: request "(?P<desc1>.*)" \[\]int\{(?P<flow>[0-9]+), (?P<thread>[0-9]+), (?P<iter>[0-9]+)\} finished lingering on (?P<width1>[0-9]+) seats, queue (?P<queue>[0-9]+) will have \d+ requests with queueset.queueSum\{.*\} waiting & \d+ requests occupying \d+ seats',
-                      consume_linger_finish)
-
-        def consume_end(match: re.Match) -> None:
-            self.eval_t = time_parse(match.group('evalTime'))
-            return
-        self.add_case(
-            r'\s*queueset_test\.go:\d+: (?P<evalTime>[-0-9 .:]+): End', consume_end)
+        self.eval_t: typing.Optional[Time] = None
         return
 
     def get_req(self, flow_str: str, thread_str: str, iter_str: str) -> Request:
@@ -381,8 +332,7 @@ class TestParser(parse.Parser, SeatAllocator, ProgressNoter):
             self.requests[reqid] = req
         return req
 
-    def parse(self, file) -> None:
-        super().parse(file)
+    def complete(self) -> None:
         queue_to_active: typing.Mapping[int, typing.List[Request]] = dict()
         for (reqid, req) in self.requests.items():
             req.complete(self.t_of_R)
@@ -419,12 +369,102 @@ class TestParser(parse.Parser, SeatAllocator, ProgressNoter):
     pass
 
 
+class TestParser(parse.Parser):
+
+    def __init__(self):
+        super(TestParser, self).__init__()
+        self.cases: typing.List[typing.Tuple[re.Pattern,
+                                             typing.Callable[[re.Match], None]]] = []
+        # QueueSet name -> its state, in order of first appearance in the log
+        self.queue_sets: typing.Mapping[str, QueueSetParse] = dict()
+        # names of QueueSets that have had events since the last End line
+        self.since_end: typing.Set[str] = set()
+
+        def consume_dispatch(match: re.Match) -> None:
+            # print(f'Parsed {match.groupdict()}')
+            qs = self.get_qs(match.group('qs'))
+            req = qs.get_req(match.group('flow'), match.group(
+                'thread'), match.group('iter'))
+            req.set_dispatch(match.group('realStartT'), match.group('realStartR'), match.group(
+                'queue'), match.group('width1'), match.group('width2'), match.group('pad'), match.group('virtStartR'), qs.find_seats)
+            qs.add_progress_point(req.real_dispatch_t, req.real_dispatch_r)
+
+        self.add_case(r'I[0-9]{4} [0-9.:]+\s+[0-9]+ queueset\.go:[0-9]+\] QS\((?P<qs>.*?)\) at [tr]=(?P<realStartT>[-0-9 .:]+) [vR]=(?P<realStartR>[0-9.]+)ss: dispatching request "(?P<desc1>.*)" \[\]int\{(?P<flow>[0-9]+), (?P<thread>[0-9]+), (?P<iter>[0-9]+)\} work \{\{?(?P<width1>[0-9]+)( (?P<width2>[0-9]+))? (?P<pad>[0-9.]+[mun' '\xb5' r']?s)(\} [0-9]+)\} from queue (?P<queue>[0-9]+) with start R (?P<virtStartR>[0-9.]+)ss, queue will have [0-9]+ waiting & [0-9]+ requests occupying [0-9]+ seats, set will have [0-9]+ seats occupied',
+                      consume_dispatch)
+
+        def consume_finish(match: re.Match) -> None:
+            qs = self.get_qs(match.group('qs'))
+            req = qs.get_req(match.group('flow'), match.group(
+                'thread'), match.group('iter'))
+            req.set_finish(match.group('realEndT'), match.group('realEndR'), match.group(
+                'queue'), match.group('width'), match.group('duration'), qs.release_seats)
+            qs.add_progress_point(req.real_finish_t, req.real_finish_r)
+
+        self.add_case(r'I[0-9]{4} [0-9.:]+\s+[0-9]+ queueset\.go:[0-9]+\] QS\((?P<qs>.*?)\) at [rt]=(?P<realEndT>[-0-9 .:]+) [vR]=(?P<realEndR>[0-9.]+)ss: request "(?P<desc1>.*)" \[\]int\{(?P<flow>[0-9]+), (?P<thread>[0-9]+), (?P<iter>[0-9]+)\} finished all use of (?P<width>[0-9]+) seats, adjusted queue (?P<queue>[0-9]+) start R to (?P<newStartR>[0-9.]+)ss due to service time (?P<duration>[0-9.]+)s, queue will have \d+ requests, \d+ seats waiting & \d+ requests occupying \d+ seats',
+                      consume_finish)
+        self.add_case(r'I[0-9]{4} [0-9.:]+\s+[0-9]+ queueset\.go:[0-9]+\] QS\((?P<qs>.*?)\) at [rt]=(?P<realEndT>[-0-9 .:]+) [vR]=(?P<realEndR>[0-9.]+)ss: request "(?P<desc1>.*)" \[\]int\{(?P<flow>[0-9]+), (?P<thread>[0-9]+), (?P<iter>[0-9]+)\} finished all use of (?P<width>[0-9]+) seats, adjusted queue (?P<queue>[0-9]+) start R to (?P<newStartR>[0-9.]+)ss due to service time (?P<duration>[0-9.]+)s, queue sum: queueset.queueSum\{InitialSeatsSum:\d+, MaxSeatsSum:\d+, TotalWorkSum:[0-9a-fA-Fx]+\}, \d+ requests waiting & \d+ requests occupying \d+ seats',
+                      consume_finish)
+
+        def consume_mid(match: re.Match) -> None:
+            qs = self.get_qs(match.group('qs'))
+            req = qs.get_req(match.group('flow'), match.group(
+                'thread'), match.group('iter'))
+            req.set_mid(match.group('realMidT'), match.group('realMidR'), match.group(
+                'queue'), match.group('width1'), match.group('pad'), match.group('duration'))
+            qs.add_progress_point(req.real_mid_t, req.real_mid_r)
+
+        self.add_case(r'I[0-9]{4} [0-9.:]+\s+[0-9]+ queueset\.go:[0-9]+\] QS\((?P<qs>.*?)\) at [rt]=(?P<realMidT>[-0-9 .:]+) [vR]=(?P<realMidR>[0-9.]+)ss: request "(?P<desc1>.*)" \[\]int\{(?P<flow>[0-9]+), (?P<thread>[0-9]+), (?P<iter>[0-9]+)\} finished main use but lingering on (?P<width1>[0-9]+) seats for (?P<pad>[0-9.]+) seconds, adjusted queue (?P<queue>[0-9]+) start R to (?P<newStartR>[0-9.]+)ss due to service time (?P<duration>[0-9.]+)s, queue will have \d+ requests with queueset.queueSum\{.*\} waiting & \d+ requests occupying \d+ seats',
+                      consume_mid)
+
+        def consume_linger_finish(match: re.Match) -> None:
+            qs = self.get_qs(match.group('qs'))
+            req = qs.get_req(match.group('flow'), match.group(
+                'thread'), match.group('iter'))
+            req.finish_linger(match.group('realEndT'), match.group('realEndR'), match.group(
+                'queue'), qs.release_seats)
+            qs.add_progress_point(req.real_finish_t, req.real_finish_r)
+
+        self.add_case(r'I[0-9]{4} [0-9.:]+\s+[0-9]+ queueset\.go:[0-9]+\] QS\((?P<qs>.*?)\) at [rt]=(?P<realEndT>[-0-9 .:]+) [vR]=(?P<realEndR>[0-9.]+)ss: request "(?P<desc1>.*)" \[\]int\{(?P<flow>[0-9]+), (?P<thread>[0-9]+), (?P<iter>[0-9]+)\} finished lingering on (?P<width1>[0-9]+) seats, queue (?P<queue>[0-9]+) will have \d+ requests with queueset.queueSum\{.*\} waiting & \d+ requests occupying \d+ seats',
+                      consume_linger_finish)
+
+        def consume_end(match: re.Match) -> None:
+            # The End line does not name a QueueSet, so only credit it
+            # when exactly one candidate has been active since the last one.
+            candidates = [self.queue_sets[name] for name in self.since_end
+                          if self.queue_sets[name].eval_t is None]
+            if len(candidates) == 1:
+                candidates[0].eval_t = time_parse(match.group('evalTime'))
+            self.since_end.clear()
+            return
+        self.add_case(
+            r'\s*queueset_test\.go:\d+: (?P<evalTime>[-0-9 .:]+): End', consume_end)
+        return
+
+    def get_qs(self, name: str) -> QueueSetParse:
+        qs = self.queue_sets.get(name)
+        if qs is None:
+            qs = QueueSetParse(name)
+            self.queue_sets[name] = qs
+        self.since_end.add(name)
+        return qs
+
+    def parse(self, file) -> None:
+        super().parse(file)
+        for qs in self.queue_sets.values():
+            qs.complete()
+        return
+
+    pass
+
+
 if __name__ == '__main__':
     arg_parser = argparse.ArgumentParser(description='parse queueset test log')
     arg_parser.add_argument('infile', type=argparse.FileType('rt'))
     args = arg_parser.parse_args()
     test_parser = TestParser()
     test_parser.parse(args.infile)
-    for (reqid, req) in test_parser.requests.items():
-        print(req.as_dict())
+    for (name, qs) in test_parser.queue_sets.items():
+        print(f'QS({name})')
+        for (reqid, req) in qs.requests.items():
+            print(req.as_dict())
     pass
@@ -4,6 +4,7 @@ import argparse
 import cairo
 import parse_test
 import subprocess
+import sys
 import typing
 
 
@@ -25,7 +26,7 @@ def text_in_rectangle(context: cairo.Context, text: str, left: float, top: float
     return
 
 
-def render_parse(surface: cairo.Surface, parse: parse_test.TestParser,
+def render_parse(surface: cairo.Surface, parse: parse_test.QueueSetParse,
                  vert_per_second: float, top_text: str, bottom_text: str) -> None:
     context = cairo.Context(surface)
     context.select_font_face(
@@ -60,7 +61,7 @@ def render_parse(surface: cairo.Surface, parse: parse_test.TestParser,
             page_width, bottom_text_orig[0] + bottom_text_extents.x_advance)
     surface.set_size(page_width, page_height)
     print(
-        f'num_seats={num_seats}, num_queues={num_queues}, queue_lane_sum={parse.queue_lane_sum}, page_width={page_width}, page_height={page_height}')
+        f'QS({parse.name}): num_seats={num_seats}, num_queues={num_queues}, queue_lane_sum={parse.queue_lane_sum}, page_width={page_width}, page_height={page_height}')
     if top_text:
         text_in_rectangle(context, top_text, 0, 0, page_width, vert_per_header)
     if bottom_text:
@@ -154,11 +155,12 @@ def render_parse(surface: cairo.Surface, parse: parse_test.TestParser,
         context.rectangle(qleft, qtop, qwidth, qheight)
         text_in_rectangle(context, reqid_str, qleft, qtop, qwidth, qheight)
         context.stroke()
-    eval_y = seats_orig[1] + vert_per_second*(parse.eval_t - parse.min_t)
-    context.move_to(hor_per_track*0.1, eval_y)
-    context.line_to(page_width - hor_per_track*0.1, eval_y)
-    context.set_source_rgb(1, 0, 0)
-    context.stroke()
+    if parse.eval_t is not None:
+        eval_y = seats_orig[1] + vert_per_second*(parse.eval_t - parse.min_t)
+        context.move_to(hor_per_track*0.1, eval_y)
+        context.line_to(page_width - hor_per_track*0.1, eval_y)
+        context.set_source_rgb(1, 0, 0)
+        context.stroke()
     context.show_page()
     return
 
@@ -191,8 +193,16 @@ if __name__ == '__main__':
         bottom_text = args.bottom_text
     test_parser = parse_test.TestParser()
     test_parser.parse(args.infile)
+    if not test_parser.queue_sets:
+        sys.exit(f'no QueueSets found in {args.infile.name}')
     surface = cairo.PDFSurface(args.outfile, 100, 100)
-    render_parse(surface, test_parser, args.vert_per_sec,
-                 args.top_text, bottom_text)
+    # One page per QueueSet, all from the single parse above
+    multi = len(test_parser.queue_sets) > 1
+    for (name, qs) in test_parser.queue_sets.items():
+        top_text = args.top_text
+        if multi:
+            top_text = f'{top_text} QS({name})' if top_text else f'QS({name})'
+        render_parse(surface, qs, args.vert_per_sec,
+                     top_text, bottom_text)
     surface.finish()
     args.outfile.close()